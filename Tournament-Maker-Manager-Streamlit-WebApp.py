@@ -1,11 +1,19 @@
 import streamlit as st
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.api_core.exceptions import InvalidArgument
 import uuid
 import os
 import base64
-import tempfile
+import json
+import io
 import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import threading
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
@@ -18,7 +26,31 @@ TOURNAMENT_TYPES = {
     "Knockout (Elimination)": "Knockout",
     "Combination (Group + Knockout)": "Group + Knockout"
 }
+TOURNAMENT_TYPE_LABELS = {value: label for label, value in TOURNAMENT_TYPES.items()} # Stored type -> display label
 SPORTS_SUPPORTED = ["Football", "Cricket", "Basketball", "Badminton"]
+PLAYER_STAT_FIELDS = ["scorers", "assists", "runs", "wickets", "points", "sets"]
+# (stat field, display name) pairs shown on the Stats tab for each sport
+STAT_CATEGORIES = {
+    "Football": (("scorers", "Goals"), ("assists", "Assists")),
+    "Cricket": (("runs", "Runs"), ("wickets", "Wickets")),
+    "Basketball": (("points", "Points"), ("assists", "Assists")),
+    "Badminton": (("sets", "Sets Won"),),
+}
+TOP_PLAYERS_LIMIT = 20 # Rows shown per stat category
+PARQUET_EXPORT_MIN_ROWS = 1000 # Exports at least this long are also offered as compressed Parquet
+TOURNAMENT_INDEX_LIMIT = 200 # Tournaments listed in the selector per search
+TOURNAMENT_CACHE_TTL = 30 # Seconds before a loaded tournament is checked for other editors' changes
+MAX_BATCH_SIZE = 400 # Stay well below Firestore's 500 writes per batch
+MAX_TRANSACTION_WRITES = 500 # Firestore's limit for a single commit
+IO_THREAD_PREFIX = "firestore-io" # Name prefix of the I/O pool's threads
+STANDING_FIELDS = ["P", "W", "D", "L", "Pts", "F", "A"]
+# Round-robin orders (by team index, grouped into rounds) in which no team plays two matches in a row.
+# The circle method cannot guarantee this; 3 and 4 teams have no such order at all.
+FAIR_ROUND_ROBIN_SCHEDULES = {
+    5: [[(0, 1), (2, 3)], [(0, 4), (1, 2)], [(3, 4), (0, 2)], [(1, 3), (2, 4)], [(0, 3), (1, 4)]],
+    6: [[(0, 1), (2, 3), (4, 5)], [(0, 2), (1, 4), (3, 5)], [(0, 4), (1, 3), (2, 5)],
+        [(0, 3), (1, 5), (2, 4)], [(0, 5), (1, 2), (3, 4)]],
+}
 
 st.set_page_config(page_title=APP_TITLE, page_icon=PAGE_ICON, layout="wide")
 st.title(APP_TITLE)
@@ -26,7 +58,8 @@ st.title(APP_TITLE)
 # --- Firebase Secure Setup (Render-Compatible) ---
 @st.cache_resource
 def initialize_firebase():
-    """Initializes Firebase Admin SDK securely using environment variable."""
+    """Initializes Firebase Admin SDK securely using environment variable.
+    Cached as a resource, so the key is decoded once per server process rather than per rerun."""
     firebase_key_b64 = os.getenv("FIREBASE_KEY_B64")
 
     if not firebase_key_b64:
@@ -35,16 +68,10 @@ def initialize_firebase():
 
     try:
         firebase_json = base64.b64decode(firebase_key_b64.encode())
-        # Use NamedTemporaryFile to ensure the file is handled correctly across OS
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as tmp:
-            tmp.write(firebase_json)
-            tmp_path = tmp.name
-
-        cred = credentials.Certificate(tmp_path)
+        # The Admin SDK accepts the parsed service account dict, so no temporary key file is written
+        cred = credentials.Certificate(json.loads(firebase_json))
         if not firebase_admin._apps:
             firebase_admin.initialize_app(cred)
-        # Clean up the temporary file immediately after initialization
-        os.unlink(tmp_path)
         return firestore.client()
     except Exception as e:
         st.error(f"❌ Failed to initialize Firebase: {e}")
@@ -52,16 +79,271 @@ def initialize_firebase():
 
 db = initialize_firebase()
 
+@st.cache_resource
+def get_io_pool():
+    """Thread pool shared across sessions for overlapping independent Firestore calls."""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix=IO_THREAD_PREFIX)
+
+def run_concurrently(*calls):
+    """Runs independent zero-argument Firestore calls on the I/O pool and waits for all of them,
+    re-raising the first error. The calls must not use Streamlit APIs, which need the script thread."""
+    if threading.current_thread().name.startswith(IO_THREAD_PREFIX):
+        # Already on a pool thread: waiting on the pool from here could exhaust it, so run in place
+        return [call() for call in calls]
+    futures = [get_io_pool().submit(call) for call in calls]
+    return [future.result() for future in futures]
+
 # --- Utility Functions ---
+def tournament_document(tid):
+    """Returns the tournament's DocumentReference. Building one is cheap and does no I/O,
+    and this stays a plain function so it is safe to call from the I/O pool's threads."""
+    return db.collection("tournaments").document(tid)
+
+def field_path(*parts):
+    """Joins names into a Firestore field path for update(), quoting any part (such as a team name)
+    that contains dots or other characters a dotted path cannot hold."""
+    return firestore.FieldPath(*parts).to_api_repr()
+
+def matches_collection(tid):
+    """Returns the subcollection holding one document per match of a tournament."""
+    return tournament_document(tid).collection("matches")
+
+def player_stats_collection(tid):
+    """Returns the subcollection holding one stats document per player of a tournament."""
+    return tournament_document(tid).collection("player_stats")
+
+def player_stats_document(tid, player_name):
+    """Returns a player's stats document. Player names may contain characters that are not
+    allowed in document IDs, so the ID is derived from the name and the name is stored as a field."""
+    return player_stats_collection(tid).document(uuid.uuid5(uuid.NAMESPACE_OID, player_name).hex)
+
+def commit_in_batches(operations, batch_size=MAX_BATCH_SIZE):
+    """Commits (method, *args) write operations through WriteBatches of at most batch_size.
+    The batch size is halved whenever Firestore rejects a commit as too large."""
+    start = 0
+    while start < len(operations):
+        chunk = operations[start:start + batch_size]
+        batch = db.batch()
+        for method, *args in chunk:
+            getattr(batch, method)(*args)
+        try:
+            batch.commit()
+        except InvalidArgument:
+            if batch_size == 1:
+                raise
+            batch_size //= 2
+            continue
+        start += len(chunk)
+
+def commit_in_parallel_batches(operations, batch_size=MAX_BATCH_SIZE):
+    """Like commit_in_batches, but commits the batches concurrently on the I/O pool.
+    Only for operations that do not depend on each other's order."""
+    run_concurrently(*(
+        partial(commit_in_batches, operations[start:start + batch_size], batch_size)
+        for start in range(0, len(operations), batch_size)
+    ))
+
+def write_matches(tid, matches):
+    """Writes matches as ordered subcollection documents and drops any legacy inline array."""
+    matches_ref = matches_collection(tid)
+    commit_in_parallel_batches([("set", matches_ref.document(str(i)), {**match, "order": i}) for i, match in enumerate(matches)])
+    # Only drop the inline array once every match document is written
+    tournament_document(tid).update({"matches": firestore.DELETE_FIELD})
+
+def delete_documents(collection_ref):
+    """Deletes every document of a (sub)collection."""
+    commit_in_parallel_batches([("delete", doc_ref) for doc_ref in collection_ref.list_documents()])
+
+def delete_matches(tid):
+    """Deletes every match document of a tournament."""
+    delete_documents(matches_collection(tid))
+
+def player_stat_count_operations(tid, counts):
+    """Builds the write operations applying {(category, player_name): count} increments,
+    one merged set per player document."""
+    fields_by_player = {}
+    for (category, player), count in counts.items():
+        fields_by_player.setdefault(player, {"player": player})[category] = firestore.Increment(count)
+    return [
+        ("set", player_stats_document(tid, player), fields, True) # merge=True
+        for player, fields in fields_by_player.items()
+    ]
+
+def write_player_stat_counts(tid, counts):
+    """Applies {(category, player_name): count} increments to the player stats documents."""
+    commit_in_batches(player_stat_count_operations(tid, counts))
+
+def inline_player_stat_entries(data):
+    """Yields (category, player_name, keys, count) for stat maps stored on an older tournament document.
+    Names containing dots were written as nested maps ({"J": {" Smith": 1}}), so nested keys are
+    joined back with dots and keys is the path to delete; values that are not counts are skipped."""
+    def walk(value, keys):
+        if isinstance(value, dict):
+            for key, inner in value.items():
+                yield from walk(inner, keys + (key,))
+        elif keys and isinstance(value, (int, float)) and not isinstance(value, bool) and value:
+            yield keys, value
+    for category in PLAYER_STAT_FIELDS:
+        for keys, count in walk(data.get(category), ()):
+            yield category, ".".join(keys), keys, count
+
+@firestore.transactional
+def migrate_inline_player_stats(transaction, tid):
+    """Moves up to one commit's worth of stat maps from the tournament document into player_stats and
+    returns how many entries are left. Each moved entry is deleted in the same commit as its increment,
+    so a retried or concurrent migration never counts it twice and a large one can run in several commits."""
+    tournament_ref = tournament_document(tid)
+    snapshot = next(iter(transaction.get_all([tournament_ref])))
+    entries = list(inline_player_stat_entries(snapshot.to_dict() or {}))
+    counts, players, moved_paths = {}, set(), []
+    for category, player, keys, count in entries:
+        if player not in players and len(players) >= MAX_TRANSACTION_WRITES - 1:
+            break # One write per player document plus the tournament update
+        players.add(player)
+        counts[(category, player)] = counts.get((category, player), 0) + count
+        moved_paths.append(field_path(category, *keys))
+    if not moved_paths:
+        return 0
+    operations = player_stat_count_operations(tid, counts)
+    operations.append(("update", tournament_ref, {path: firestore.DELETE_FIELD for path in moved_paths}))
+    for method, *args in operations:
+        getattr(transaction, method)(*args)
+    return len(entries) - len(moved_paths)
+
 @st.cache_data(ttl=60) # Cache data for 60 seconds
-def get_all_tournaments_data():
-    """Fetches all tournaments from Firestore."""
+def get_top_players(tid, category, limit=TOP_PLAYERS_LIMIT):
+    """Fetches the highest (player, value) pairs of a stat category, sorted and limited by Firestore."""
     try:
-        docs = db.collection("tournaments").stream()
-        return {doc.id: doc.to_dict() for doc in docs}
+        docs = (player_stats_collection(tid)
+                .order_by(category, direction=firestore.Query.DESCENDING)
+                .limit(limit)
+                .stream())
+        return [(doc.get("player"), doc.get(category)) for doc in docs]
     except Exception as e:
-        st.error(f"Error fetching tournaments: {e}")
-        return {}
+        st.error(f"Error fetching {category} stats: {e}")
+        return []
+
+@st.cache_data(ttl=60) # Cache data for 60 seconds
+def get_all_player_stats(tid, sport):
+    """Fetches every player's stats for the sport's categories as one wide table (one row per player).
+    Unlike the per-category tables this is not limited to the top players."""
+    categories = STAT_CATEGORIES[sport]
+    try:
+        docs = player_stats_collection(tid).select(["player", *(key for key, _ in categories)]).stream()
+        stats_df = pd.DataFrame.from_records(
+            [doc.to_dict() for doc in docs], columns=["player", *(key for key, _ in categories)]
+        ).fillna(0) # A missing field means the player has none of that stat
+        stats_df = stats_df.astype({key: "int32" for key, _ in categories})
+        stats_df = stats_df.rename(columns={"player": "Player", **dict(categories)})
+        return stats_df.sort_values(by=[name for _, name in categories], ascending=False, ignore_index=True)
+    except Exception as e:
+        st.error(f"Error fetching player stats: {e}")
+        return None
+
+@st.cache_resource
+def get_tournament_names():
+    """Live {id: name} map of every tournament, shared by all sessions of the server process.
+    A Firestore snapshot listener keeps it up to date. Listeners cannot project fields, so every
+    tournament document is streamed in full, each one received (and each later change) is billed
+    as a read, and the listener holds all of them in memory. If the listener fails it is dropped
+    and the next call subscribes again."""
+    index = {"names": {}, "lock": threading.Lock(), "loaded": threading.Event(), "failed": False}
+
+    def on_snapshot(col_snapshot, changes, read_time):
+        # Runs on the listener's thread, hence the lock around the shared map
+        try:
+            with index["lock"]:
+                for change in changes:
+                    if change.type.name == "REMOVED":
+                        index["names"].pop(change.document.id, None)
+                    else:
+                        index["names"][change.document.id] = change.document.get("name")
+        except Exception:
+            index["failed"] = True
+        index["loaded"].set()
+
+    index["watch"] = db.collection("tournaments").on_snapshot(on_snapshot)
+    return index
+
+def drop_tournament_names(index):
+    """Stops a failed listener and forgets it, so the next get_tournament_names call subscribes again."""
+    try:
+        index["watch"].unsubscribe()
+    except Exception:
+        pass # The watch may already be closed
+    get_tournament_names.clear()
+
+def get_tournament_index(name_prefix="", limit=TOURNAMENT_INDEX_LIMIT):
+    """Returns (id, name) pairs of the first tournaments by name, optionally only those whose
+    name starts with name_prefix (ignoring case)."""
+    index = get_tournament_names()
+    if not index["loaded"].wait(timeout=10) or index["failed"]:
+        drop_tournament_names(index)
+        st.error("Error fetching tournaments: the Firestore listener did not respond. Try again.")
+        return []
+    with index["lock"]:
+        entries = list(index["names"].items())
+    name_prefix = name_prefix.casefold()
+    entries = [(tid, name) for tid, name in entries if name and name.casefold().startswith(name_prefix)]
+    return sorted(entries, key=lambda entry: entry[1].casefold())[:limit]
+
+def set_tournament_name(tid, name):
+    """Records a local create (name) or delete (None) in the index right away,
+    ahead of the listener's own event for it."""
+    index = get_tournament_names()
+    with index["lock"]:
+        if name is None:
+            index["names"].pop(tid, None)
+        else:
+            index["names"][tid] = name
+
+@st.cache_data(ttl=TOURNAMENT_CACHE_TTL)
+def get_tournament(tid):
+    """Fetches a single tournament document and its matches from Firestore.
+    Player stats are not included; they are queried per category by get_top_players."""
+    try:
+        # The document and its matches are independent reads, so they are issued concurrently
+        pool = get_io_pool()
+        doc_future = pool.submit(tournament_document(tid).get)
+        matches_future = pool.submit(lambda: [m.to_dict() for m in matches_collection(tid).order_by("order").stream()])
+        doc = doc_future.result()
+        matches = matches_future.result()
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        if not matches and data.get("matches"):
+            # Older tournaments kept matches inline; move them to the subcollection once
+            matches = data["matches"]
+            write_matches(tid, matches)
+        data["matches"] = matches
+        if any(inline_player_stat_entries(data)):
+            # Older tournaments kept player stats as maps on the document; move them to player_stats once.
+            # A failed migration is reported but does not stop the tournament from loading.
+            try:
+                remaining = migrate_inline_player_stats(db.transaction(), tid)
+                while remaining:
+                    left = migrate_inline_player_stats(db.transaction(), tid)
+                    if left >= remaining:
+                        break # No progress; leave the rest for the next load
+                    remaining = left
+            except Exception as e:
+                st.warning(f"Could not move the older player stats of tournament {tid}: {e}")
+        return data
+    except Exception as e:
+        st.error(f"Error fetching tournament {tid}: {e}")
+        return None
+
+def load_tournament(tid, refresh=True):
+    """Returns the session copy of a tournament, fetching it on first use and again once it is
+    TOURNAMENT_CACHE_TTL seconds old (unless refresh is False). Every tab and write helper works
+    from this one copy; successful writes patch or drop it, so this session's own edits never wait for the TTL."""
+    key, loaded_key = f"tdata_{tid}", f"tdata_loaded_{tid}"
+    now = time.monotonic()
+    expired = refresh and now - st.session_state.get(loaded_key, 0) >= TOURNAMENT_CACHE_TTL
+    if st.session_state.get(key) is None or expired:
+        st.session_state[key] = get_tournament(tid)
+        st.session_state[loaded_key] = now
+    return st.session_state[key]
 
 def update_firestore_doc(collection, doc_id, data_to_update):
     """Generic function to update a Firestore document."""
@@ -74,27 +356,22 @@ def update_firestore_doc(collection, doc_id, data_to_update):
         return False
 
 # --- Firebase CRUD Operations ---
-def create_tournament(name, type_, sport):
-    """Creates a new tournament in Firestore."""
+def create_tournament(name, type_, sport, teams):
+    """Creates a new tournament in Firestore, including its initial teams."""
     tid = str(uuid.uuid4())
+    teams = list(dict.fromkeys(teams)) # Same uniqueness as ArrayUnion, keeping the entered order
     initial_data = {
         "name": name,
         "type": type_,
         "sport": sport,
-        "teams": [],
-        "players": {}, # New: Store players per team {team_name: [player1, player2]}
-        "matches": [],
-        "created_at": firestore.SERVER_TIMESTAMP,
-        "scorers": {},
-        "assists": {},
-        "runs": {},
-        "wickets": {},
-        "points": {},
-        "sets": {}
+        "teams": teams,
+        "players": {team: [] for team in teams}, # Store players per team {team_name: [player1, player2]}
+        "created_at": firestore.SERVER_TIMESTAMP
+        # Player stats live in the player_stats subcollection
     }
     try:
-        db.collection("tournaments").document(tid).set(initial_data)
-        st.session_state["refresh_data"] = True
+        tournament_document(tid).set(initial_data)
+        set_tournament_name(tid, name) # Show it in the selector without waiting for the listener
         return tid
     except Exception as e:
         st.error(f"Error creating tournament: {e}")
@@ -103,75 +380,193 @@ def create_tournament(name, type_, sport):
 def delete_tournament(tid):
     """Deletes a tournament from Firestore."""
     try:
-        db.collection("tournaments").document(tid).delete()
-        st.session_state["refresh_data"] = True
+        # Subcollections are not removed with their parent document; they are independent, so clear them together
+        run_concurrently(lambda: delete_matches(tid), lambda: delete_documents(player_stats_collection(tid)))
+        tournament_document(tid).delete()
+        set_tournament_name(tid, None)
+        # Only this tournament's data is stale; other session copies stay valid
+        st.session_state.pop(f"tdata_{tid}", None)
+        st.session_state.pop(f"pending_stats_{tid}", None)
+        get_tournament.clear()
         return True
     except Exception as e:
         st.error(f"Error deleting tournament: {e}")
         return False
 
-def add_team_to_tournament(tid, team_name):
-    """Adds a team to an existing tournament."""
-    if update_firestore_doc("tournaments", tid, {"teams": firestore.ArrayUnion([team_name])}):
-        update_firestore_doc("tournaments", tid, {f"players.{team_name}": []}) # Initialize empty player list for new team
-        return True
-    return False
+def add_teams_to_tournament(tid, team_names):
+    """Adds new teams to an existing tournament in a single update."""
+    return update_firestore_doc("tournaments", tid, {
+        "teams": firestore.ArrayUnion(team_names),
+        **{field_path("players", team_name): [] for team_name in team_names} # Initialize empty player lists for new teams
+    })
 
 def remove_team_from_tournament(tid, team_name):
-    """Removes a team from an existing tournament."""
-    if update_firestore_doc("tournaments", tid, {"teams": firestore.ArrayRemove([team_name])}):
-        # Also remove players associated with this team
-        doc_ref = db.collection("tournaments").document(tid)
-        doc_data = doc_ref.get().to_dict()
-        if doc_data and "players" in doc_data:
-            players = doc_data["players"]
-            if team_name in players:
-                del players[team_name]
-                update_firestore_doc("tournaments", tid, {"players": players})
-        return True
-    return False
+    """Removes a team and its players from an existing tournament."""
+    return update_firestore_doc("tournaments", tid, {
+        "teams": firestore.ArrayRemove([team_name]),
+        field_path("players", team_name): firestore.DELETE_FIELD
+    })
 
 def add_player_to_team(tid, team_name, player_name):
-    """Adds a player to a specific team within a tournament."""
-    doc_ref = db.collection("tournaments").document(tid)
-    doc_data = doc_ref.get().to_dict()
-    if doc_data and "players" in doc_data:
-        players = doc_data["players"]
-        if team_name in players:
-            if player_name not in players[team_name]: # Avoid duplicates
-                players[team_name].append(player_name)
-                return update_firestore_doc("tournaments", tid, {"players": players})
-    return False
+    """Adds a player to a specific team within a tournament (ArrayUnion skips duplicates)."""
+    return update_firestore_doc("tournaments", tid, {field_path("players", team_name): firestore.ArrayUnion([player_name])})
 
 def remove_player_from_team(tid, team_name, player_name):
     """Removes a player from a specific team within a tournament."""
-    doc_ref = db.collection("tournaments").document(tid)
-    doc_data = doc_ref.get().to_dict()
-    if doc_data and "players" in doc_data:
-        players = doc_data["players"]
-        if team_name in players and player_name in players[team_name]:
-            players[team_name].remove(player_name)
-            return update_firestore_doc("tournaments", tid, {"players": players})
-    return False
+    return update_firestore_doc("tournaments", tid, {field_path("players", team_name): firestore.ArrayRemove([player_name])})
 
 def save_matches(tid, matches):
     """Saves generated matches to a tournament."""
-    return update_firestore_doc("tournaments", tid, {"matches": matches})
+    try:
+        write_matches(tid, matches)
+        st.session_state["refresh_data"] = True
+        return True
+    except Exception as e:
+        st.error(f"Error saving matches: {e}")
+        return False
 
-def update_match_score(tid, index, score1, score2):
-    """Updates the score of a specific match."""
-    doc = db.collection("tournaments").document(tid).get()
-    matches = doc.to_dict().get("matches", [])
-    if 0 <= index < len(matches):
+def reset_tournament_results(tid):
+    """Removes all matches, standings and player stats from a tournament, keeping its teams and players."""
+    try:
+        match_refs, stats_refs = run_concurrently(
+            lambda: list(matches_collection(tid).list_documents()),
+            lambda: list(player_stats_collection(tid).list_documents()),
+        )
+        operations = [("delete", doc_ref) for doc_ref in match_refs + stats_refs]
+        # Inline stat maps are migrated when the tournament is loaded, so only the standings remain on the document
+        operations.append(("update", tournament_document(tid), {"standings": firestore.DELETE_FIELD}))
+        # Up to MAX_BATCH_SIZE operations this is a single batch, so the reset applies all at once
+        commit_in_parallel_batches(operations)
+    except Exception as e:
+        st.session_state["refresh_data"] = True # A partial reset may have been written
+        st.error(f"Error resetting matches and stats: {e}")
+        return False
+    # The result of a reset is known, so the session copy is emptied in place instead of refetched
+    data = st.session_state.get(f"tdata_{tid}")
+    if data is not None:
+        data["matches"] = []
+        data.pop("standings", None)
+    st.session_state.pop(f"pending_stats_{tid}", None) # Queued stats belonged to the cleared matches
+    get_tournament.clear()
+    get_top_players.clear()
+    get_all_player_stats.clear()
+    return True
+
+@firestore.transactional
+def write_match_scores(transaction, tid, new_scores):
+    """Transaction body for update_match_scores. The tournament document and the edited matches are
+    read inside the transaction, so the standings update starts from what is stored and Firestore
+    retries if another editor changes either of them first.
+    Returns the standings change as ("delta", {(team, field): change}) or ("full", standings)."""
+    tournament_ref = tournament_document(tid)
+    match_refs = {index: matches_collection(tid).document(str(index)) for index in new_scores}
+    snapshots = {snap.reference.path: snap for snap in transaction.get_all([tournament_ref, *match_refs.values()])}
+    tournament = snapshots[tournament_ref.path].to_dict()
+    stored = {index: snapshots[ref.path].to_dict() for index, ref in match_refs.items()}
+    teams, sport = tournament.get("teams", []), tournament["sport"]
+
+    if "standings" in tournament:
+        deltas = Counter()
+        for index, (score1, score2) in new_scores.items():
+            deltas.update(standings_delta(stored[index], score1, score2, teams, sport))
+        deltas = {key: change for key, change in deltas.items() if change}
+        standings_update = {field_path("standings", team, field): firestore.Increment(change) for (team, field), change in deltas.items()}
+        standings_change = ("delta", deltas)
+    else:
+        # No standings stored yet (new fixtures or older tournaments): write them in full once,
+        # from every match as stored now rather than from this session's copy
+        matches = [snap.to_dict() for snap in transaction.get(matches_collection(tid).order_by("order"))]
+        results = list(match_results_key(matches))
+        for index, (score1, score2) in new_scores.items():
+            results[index] = (stored[index]["team1"], stored[index]["team2"], score1, score2)
+        lb_df = calculate_leaderboard(tuple(results), tuple(teams), sport)
+        standings_update = {"standings": standings_from_leaderboard(lb_df)}
+        standings_change = ("full", standings_update["standings"])
+
+    for index, (score1, score2) in new_scores.items():
+        transaction.update(match_refs[index], {"score1": score1, "score2": score2})
+    if standings_update:
+        transaction.update(tournament_ref, standings_update)
+    return standings_change
+
+def update_match_scores(tid, new_scores):
+    """Saves edited scores ({match index: (score1, score2)}) in one transaction and applies
+    the change to the stored standings."""
+    data = load_tournament(tid, refresh=False) or {}
+    matches = data.get("matches", [])
+    new_scores = {index: scores for index, scores in new_scores.items() if 0 <= index < len(matches)}
+    if not new_scores:
+        return False
+    try:
+        kind, standings_change = write_match_scores(db.transaction(), tid, new_scores)
+    except Exception as e:
+        st.error(f"Error updating match scores: {e}")
+        return False
+    get_tournament.clear() # Later loads must not start from the cached pre-save document
+    if kind == "delta" and "standings" not in data:
+        # Another editor wrote the standings after this copy was loaded; reload it rather than guess
+        st.session_state.pop(f"tdata_{tid}", None)
+        return True
+    # Apply the write to the session copy instead of refetching the tournament and its matches
+    for index, (score1, score2) in new_scores.items():
         matches[index]["score1"] = score1
         matches[index]["score2"] = score2
-        return update_firestore_doc("tournaments", tid, {"matches": matches})
-    return False
+    if kind == "full":
+        data["standings"] = standings_change
+    else:
+        for (team, field), change in standings_change.items():
+            team_standings = data["standings"].setdefault(team, dict.fromkeys(STANDING_FIELDS, 0))
+            team_standings[field] = team_standings.get(field, 0) + change
+    return True
+
+@firestore.transactional
+def write_rebuilt_standings(transaction, tid):
+    """Transaction body for rebuild_standings. The teams and every match are read inside the
+    transaction, so the standings match what is stored even if another editor saved scores since."""
+    tournament_ref = tournament_document(tid)
+    tournament = next(iter(transaction.get_all([tournament_ref]))).to_dict()
+    matches = [snap.to_dict() for snap in transaction.get(matches_collection(tid).order_by("order"))]
+    lb_df = calculate_leaderboard(match_results_key(matches), tuple(tournament.get("teams", [])), tournament["sport"])
+    transaction.update(tournament_ref, {"standings": standings_from_leaderboard(lb_df)})
+
+def rebuild_standings(tid):
+    """Recomputes the stored standings from every match result in Firestore."""
+    try:
+        write_rebuilt_standings(db.transaction(), tid)
+    except Exception as e:
+        st.error(f"Error rebuilding standings for tournament {tid}: {e}")
+        return False
+    st.session_state.pop(f"tdata_{tid}", None) # Reload the copy, with the matches the rebuild read
+    get_tournament.clear()
+    return True
+
+def record_player_stat_counts(tid, counts):
+    """Writes stat increments to the players' own documents, so live stat entry does not
+    contend on the tournament document."""
+    if not counts:
+        return False
+    try:
+        write_player_stat_counts(tid, counts)
+        st.session_state["refresh_data"] = True
+        return True
+    except Exception as e:
+        st.error(f"Error recording player stats: {e}")
+        return False
 
-def update_player_stat(tid, category, player_name, increment_by=1):
-    """Increments a player's stat by a given amount."""
-    ref = db.collection("tournaments").document(tid)
-    return update_firestore_doc("tournaments", tid, {f"{category}.{player_name}": firestore.Increment(increment_by)})
+def pending_player_stats(tid):
+    """Returns this session's not-yet-saved stat events for a tournament as a Counter of (category, player_name)."""
+    return st.session_state.setdefault(f"pending_stats_{tid}", Counter())
+
+def queue_player_stats(tid, stat_events):
+    """Adds (category, player_name) stat events to the pending stats; nothing is written until they are saved."""
+    pending_player_stats(tid).update((category, player) for category, player in stat_events if player)
+
+def save_pending_player_stats(tid):
+    """Writes all pending stat events at once, summed into one Increment per player and category."""
+    if record_player_stat_counts(tid, pending_player_stats(tid)):
+        del st.session_state[f"pending_stats_{tid}"]
+        return True
+    return False
 
 # --- Match Generation Logic ---
 def generate_round_robin_matches(teams):
@@ -179,54 +574,76 @@ def generate_round_robin_matches(teams):
     if not teams or len(teams) < 2:
         return []
 
-    # Ensure we work with a copy and remove BYE for actual display later
-    active_teams = teams[:]
-    n = len(active_teams)
-    if n % 2 != 0:
-        active_teams.append("BYE")
-        n += 1 # Update n for BYE team
-
-    rounds = n - 1
-    all_matches = []
-
-    for rnd in range(rounds):
-        for i in range(n // 2):
-            team1 = active_teams[i]
-            team2 = active_teams[n - 1 - i]
-            if team1 != "BYE" and team2 != "BYE":
-                all_matches.append({
-                    "team1": team1,
-                    "team2": team2,
-                    "score1": None,
-                    "score2": None,
-                    "round": rnd + 1 # Track round for display
-                })
-        # Rotate teams (except the first one if n is even, or the 'fixed' team if n is odd)
-        if n > 2: # Only rotate if there are enough teams
-            # The 'fixed' team is always teams[0].
-            # Remaining teams are rotated.
-            rotated_part = [active_teams[n-1]] + active_teams[1:n-1]
-            active_teams = [active_teams[0]] + rotated_part
-
-    return all_matches
-
-def generate_knockout_matches(teams):
-    """Generates knockout fixtures (simple initial pairings)."""
+    if len(teams) in FAIR_ROUND_ROBIN_SCHEDULES:
+        return [
+            {"team1": teams[a], "team2": teams[b], "score1": None, "score2": None, "round": rnd + 1}
+            for rnd, round_pairs in enumerate(FAIR_ROUND_ROBIN_SCHEDULES[len(teams)])
+            for a, b in round_pairs
+        ]
+
+    # Pad odd team counts with a BYE slot (index len(teams)) whose pairings are dropped
+    n = len(teams) + len(teams) % 2
+    rounds, home, away = round_robin_pairs(n)
+    played = (home < len(teams)) & (away < len(teams))
+    return [
+        {"team1": teams[i], "team2": teams[j], "score1": None, "score2": None, "round": rnd + 1} # Track round for display
+        for rnd, i, j in zip(rounds[played].tolist(), home[played].tolist(), away[played].tolist())
+    ]
+
+@st.cache_resource # Shared across reruns and sessions, so the arrays are made read-only
+def round_robin_pairs(n):
+    """Circle-method schedule for an even number of teams, as flat (round, home, away) index arrays.
+    Team n-1 stays fixed; in round r it meets team r, and teams (r+k) and (r-k) mod n-1 meet for k = 1..n/2-1.
+    The schedule only depends on n, so it is computed once per team count; the returned arrays
+    are read-only, since every session gets the same objects."""
+    m = n - 1
+    r = np.arange(m)[:, None]
+    k = np.arange(1, n // 2)[None, :]
+    home = np.hstack([np.full((m, 1), m), (r + k) % m])
+    away = np.hstack([r, (r - k) % m])
+    schedule = (np.repeat(np.arange(m), n // 2), home.ravel(), away.ravel())
+    for array in schedule:
+        array.setflags(write=False)
+    return schedule
+
+def standard_seeding(n):
+    """Bracket order of seed indices for a power-of-two field, e.g. 0,7,3,4,1,6,2,5 for 8 teams.
+    Each step interleaves the seeds with their opponents (2k - 1 - seed), so the top two seeds
+    can only meet in the final."""
+    order = np.array([0, 1])
+    while len(order) < n:
+        prev = order
+        order = np.empty(2 * len(prev), dtype=int)
+        order[0::2] = prev
+        order[1::2] = 2 * len(prev) - 1 - prev
+    return order
+
+def generate_knockout_matches(teams, seeding="random"):
+    """Generates knockout fixtures (simple initial pairings).
+    seeding="random" draws the pairings; seeding="standard" treats the team order as seeds
+    and pairs 1 vs N, 2 vs N-1, and so on, laid out in bracket order when the number of teams
+    is a power of two. The caller's list is never modified."""
     if not teams or len(teams) < 2:
         return []
-    random.shuffle(teams)
-    matches = []
+    if seeding == "standard" and len(teams) & (len(teams) - 1) == 0:
+        bracket = np.array(teams, dtype=object)[standard_seeding(len(teams))]
+        return [
+            {"team1": team1, "team2": team2, "score1": None, "score2": None, "round": 1}
+            for team1, team2 in zip(bracket[0::2].tolist(), bracket[1::2].tolist())
+        ]
+    order = random.sample(teams, len(teams)) if seeding == "random" else list(teams)
     # Ensure even number of teams for initial pairing, add BYE if needed
-    num_teams = len(teams)
-    if num_teams % 2 != 0:
-        teams.append("BYE")
-
-    for i in range(0, len(teams), 2):
-        team1 = teams[i]
-        team2 = teams[i + 1] if i + 1 < len(teams) else "BYE"
-        if team1 != "BYE" and team2 != "BYE":
-            matches.append({"team1": team1, "team2": team2, "score1": None, "score2": None, "round": 1})
-    return matches
+    if len(order) % 2 != 0:
+        order.append("BYE")
+
+    if seeding == "standard":
+        pairs = [(order[i], order[-1 - i]) for i in range(len(order) // 2)]
+    else:
+        pairs = zip(order[0::2], order[1::2])
+    return [
+        {"team1": team1, "team2": team2, "score1": None, "score2": None, "round": 1}
+        for team1, team2 in pairs if team1 != "BYE" and team2 != "BYE"
+    ]
 
 def generate_combination_matches(teams):
     """Generates group stage (round-robin) and a final knockout match."""
@@ -234,10 +651,10 @@ def generate_combination_matches(teams):
         st.warning("Combination tournament requires at least 4 teams for meaningful groups.")
         return []
 
-    random.shuffle(teams)
-    mid = len(teams) // 2
-    group_a_teams = teams[:mid]
-    group_b_teams = teams[mid:]
+    shuffled = random.sample(teams, len(teams)) # Leave the caller's team list untouched
+    mid = len(shuffled) // 2
+    group_a_teams = shuffled[:mid]
+    group_b_teams = shuffled[mid:]
 
     group_a_matches = generate_round_robin_matches(group_a_teams)
     group_b_matches = generate_round_robin_matches(group_b_teams)
@@ -257,67 +674,170 @@ def generate_combination_matches(teams):
     return group_a_matches + group_b_matches + [knockout_match]
 
 # --- Leaderboard Calculation ---
-def calculate_leaderboard(matches, teams, sport_type):
-    """Calculates and returns the leaderboard for a given tournament."""
-    leaderboard = {team: {"P": 0, "W": 0, "D": 0, "L": 0, "Pts": 0, "F": 0, "A": 0, "GD": 0} for team in teams}
-
-    for m in matches:
-        t1, t2 = m["team1"], m["team2"]
-        s1, s2 = m["score1"], m["score2"]
-
-        # Only process completed matches (both scores entered)
-        if s1 is not None and s2 is not None:
-            # Ensure teams exist in the initial leaderboard structure
-            # This handles cases where matches might contain 'BYE' or 'Group X Winner' placeholders
-            if t1 not in leaderboard or t2 not in leaderboard:
-                continue
-
-            leaderboard[t1]["P"] += 1
-            leaderboard[t2]["P"] += 1
-
-            if sport_type in ["Football", "Basketball", "Cricket"]: # Score-based sports
-                leaderboard[t1]["F"] += s1
-                leaderboard[t1]["A"] += s2
-                leaderboard[t2]["F"] += s2
-                leaderboard[t2]["A"] += s1
-
-                if s1 > s2:
-                    leaderboard[t1]["W"] += 1
-                    leaderboard[t2]["L"] += 1
-                    leaderboard[t1]["Pts"] += 3
-                elif s1 < s2:
-                    leaderboard[t2]["W"] += 1
-                    leaderboard[t1]["L"] += 1
-                    leaderboard[t2]["Pts"] += 3
-                else: # Draw
-                    leaderboard[t1]["D"] += 1
-                    leaderboard[t2]["D"] += 1
-                    leaderboard[t1]["Pts"] += 1
-                    leaderboard[t2]["Pts"] += 1
-            elif sport_type == "Badminton": # Set-based sport (simple win/loss based on sets)
-                # Assuming s1 and s2 represent sets won by each team/player
-                if s1 > s2:
-                    leaderboard[t1]["W"] += 1
-                    leaderboard[t2]["L"] += 1
-                    leaderboard[t1]["Pts"] += 1 # 1 point for a set win
-                elif s1 < s2:
-                    leaderboard[t2]["W"] += 1
-                    leaderboard[t1]["L"] += 1
-                    leaderboard[t2]["Pts"] += 1
-                else:
-                    leaderboard[t1]["D"] += 1
-                    leaderboard[t2]["D"] += 1
-                    # No points for a draw in badminton typically, adjust as needed
-
-    lb_df = pd.DataFrame.from_dict(leaderboard, orient="index").reset_index()
-    lb_df = lb_df.rename(columns={"index": "Team"})
+def match_results_key(matches):
+    """Reduces matches to a hashable tuple of (team1, team2, score1, score2) for caching."""
+    return tuple((m["team1"], m["team2"], m["score1"], m["score2"]) for m in matches)
+
+def points_for_sport(sport_type):
+    """Returns (points for a win, points for a draw), or None if the sport is not scored."""
+    if sport_type in ["Football", "Basketball", "Cricket"]: # Score-based sports
+        return 3, 1
+    if sport_type == "Badminton": # Set-based sport (simple win/loss based on sets)
+        return 1, 0 # No points for a draw in badminton typically, adjust as needed
+    return None
+
+def match_contribution(s1, s2, sport_type):
+    """Returns the standings contribution of a single result for (team1, team2)."""
+    c1 = dict.fromkeys(STANDING_FIELDS, 0)
+    c2 = dict.fromkeys(STANDING_FIELDS, 0)
+
+    # Only completed matches (both scores entered) count
+    if s1 is None or s2 is None:
+        return c1, c2
+
+    c1["P"] = c2["P"] = 1
+    points = points_for_sport(sport_type)
+    if points is None:
+        return c1, c2
+    win_pts, draw_pts = points
+    if sport_type != "Badminton": # Badminton scores are sets, not goals/runs for and against
+        c1["F"], c1["A"] = s1, s2
+        c2["F"], c2["A"] = s2, s1
+
+    if s1 > s2:
+        c1["W"], c2["L"], c1["Pts"] = 1, 1, win_pts
+    elif s1 < s2:
+        c2["W"], c1["L"], c2["Pts"] = 1, 1, win_pts
+    else: # Draw
+        c1["D"] = c2["D"] = 1
+        c1["Pts"] = c2["Pts"] = draw_pts
+    return c1, c2
+
+def sort_leaderboard(lb_df, sport_type):
+    """Adds derived columns and orders a Team-indexed leaderboard."""
     if sport_type in ["Football", "Basketball", "Cricket"]:
         lb_df["GD"] = lb_df["F"] - lb_df["A"]
-        lb_df = lb_df.sort_values(by=["Pts", "GD", "F"], ascending=[False, False, False])
-    else: # Badminton or other sports where GD/F/A might not apply
-        lb_df = lb_df.sort_values(by=["Pts", "W"], ascending=[False, False])
-    return lb_df.set_index("Team")
+        return lb_df.sort_values(by=["Pts", "GD", "F"], ascending=[False, False, False])
+    # Badminton or other sports where GD/F/A might not apply
+    lb_df["GD"] = 0
+    return lb_df.sort_values(by=["Pts", "W"], ascending=[False, False])
+
+@st.cache_data(ttl=300) # Keyed on the match results, so unchanged scores skip recomputation
+def calculate_leaderboard(match_results, teams, sport_type):
+    """Calculates and returns the leaderboard for a given tournament from scratch.
+    match_results is the tuple produced by match_results_key."""
+    results = pd.DataFrame.from_records(match_results, columns=["team1", "team2", "score1", "score2"])
+    # Only completed matches between listed teams count ('BYE' / 'Group X Winner' placeholders are skipped)
+    results = results.dropna(subset=["score1", "score2"])
+    results = results[results["team1"].isin(teams) & results["team2"].isin(teams)]
+    s1 = results["score1"].to_numpy(dtype=int)
+    s2 = results["score2"].to_numpy(dtype=int)
+
+    # Work on integer team indices: one entry per team per match, seen from that team's side
+    team_index = {team: i for i, team in enumerate(teams)}
+    side_team = np.concatenate([results["team1"].map(team_index).to_numpy(dtype=int),
+                                results["team2"].map(team_index).to_numpy(dtype=int)])
+    goals_for = np.concatenate([s1, s2])
+    goals_against = np.concatenate([s2, s1])
+    margin = np.sign(goals_for - goals_against)
+
+    stats = {"P": np.ones_like(side_team)}
+    points = points_for_sport(sport_type)
+    if points is not None:
+        win_pts, draw_pts = points
+        stats["W"] = (margin > 0).astype(int)
+        stats["D"] = (margin == 0).astype(int)
+        stats["L"] = (margin < 0).astype(int)
+        stats["Pts"] = stats["W"] * win_pts + stats["D"] * draw_pts
+        if sport_type != "Badminton": # Badminton scores are sets, not goals/runs for and against
+            stats["F"], stats["A"] = goals_for, goals_against
+
+    # bincount sums each stat per team index in a single native pass; missing stats stay zero
+    lb_df = pd.DataFrame(
+        {field: np.bincount(side_team, weights=stats[field], minlength=len(teams)).astype(int)
+         if field in stats else np.zeros(len(teams), dtype=int) for field in STANDING_FIELDS},
+        index=pd.Index(list(teams), name="Team"),
+        copy=False,
+    )
+    return sort_leaderboard(lb_df, sport_type)
+
+def standings_leaderboard(standings, teams, sport_type):
+    """Builds the leaderboard from the standings stored on the tournament document."""
+    lb_df = pd.DataFrame.from_dict(standings, orient="index", columns=STANDING_FIELDS)
+    lb_df = lb_df.reindex(teams).fillna(0).astype(int) # Teams without results show zeros
+    lb_df.index.name = "Team"
+    return sort_leaderboard(lb_df, sport_type)
+
+@st.cache_data # Keyed on the DataFrame's contents, so an unchanged table is not re-encoded
+def dataframe_csv(df, index=True):
+    """Encodes a DataFrame as UTF-8 CSV for download."""
+    return df.to_csv(index=index).encode('utf-8')
+
+@st.cache_data # Keyed on the DataFrame's contents, so an unchanged table is not re-encoded
+def dataframe_parquet(df):
+    """Encodes a DataFrame as Snappy-compressed Parquet for download; much smaller than CSV for long tables."""
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False, compression="snappy")
+    return buffer.getvalue()
+
+def standings_from_leaderboard(lb_df):
+    """Converts a leaderboard DataFrame into the stored standings map."""
+    return {team: {field: int(row[field]) for field in STANDING_FIELDS} for team, row in lb_df.iterrows()}
+
+def standings_delta(match, score1, score2, teams, sport_type):
+    """Returns the per-field changes ({(team, field): change}) that move a match's
+    standings contribution from its stored result to a new one."""
+    t1, t2 = match["team1"], match["team2"]
+    if t1 not in teams or t2 not in teams:
+        return {}
+    old1, old2 = match_contribution(match["score1"], match["score2"], sport_type)
+    new1, new2 = match_contribution(score1, score2, sport_type)
+    deltas = {}
+    for team, old, new in ((t1, old1, new1), (t2, old2, new2)):
+        for field in STANDING_FIELDS:
+            if new[field] != old[field]:
+                deltas[(team, field)] = new[field] - old[field]
+    return deltas
+
+# --- Fixtures Display ---
+def fixtures_key(matches):
+    """Reduces matches to a hashable tuple of (team1, team2, score1, score2, group, round) for caching."""
+    return tuple((m["team1"], m["team2"], m["score1"], m["score2"], m.get("group"), m.get("round")) for m in matches)
+
+SCORE_COLUMNS = ["Score 1", "Score 2"]
+
+@st.cache_data
+def build_match_df(fixtures):
+    """Builds the fixtures table from fixtures_key rows, with nullable integer score columns.
+    The Group and Round columns are only shown when some match has them. Round stays an object
+    column unless every round is numbered, since combination finals use round "Final"."""
+    match_df = pd.DataFrame.from_records(
+        fixtures, columns=["Team 1", "Team 2", *SCORE_COLUMNS, "Group", "Round"]
+    ).astype({column: "Int32" for column in SCORE_COLUMNS})
+    if all(isinstance(round_, int) for round_ in match_df["Round"].dropna()):
+        match_df["Round"] = match_df["Round"].astype("Int32")
+    match_df.insert(0, "Match #", np.arange(1, len(match_df) + 1, dtype="int32"))
+    return match_df.drop(columns=[column for column in ("Group", "Round") if match_df[column].isna().all()])
+
+def changed_match_scores(original_df, edited_df):
+    """Returns {match index: (score1, score2)} for the rows whose scores were edited.
+    Cleared cells become None, so a score can be reset to unplayed."""
+    # NA never compares equal, so it is replaced by a value no score can take
+    original = original_df[SCORE_COLUMNS].fillna(-1)
+    edited = edited_df[SCORE_COLUMNS].fillna(-1)
+    changed = edited.ne(original).any(axis=1)
+    return {
+        int(idx): tuple(None if score < 0 else int(score) for score in scores)
+        for idx, scores in zip(edited.index[changed], edited.loc[changed].itertuples(index=False))
+    }
 
+# --- Player Statistics ---
+@st.cache_data(max_entries=64) # Keyed on the ranked rows, so unchanged stats reuse the table and CSV
+def build_stats_artifacts(category_name, ranked_stats):
+    """Builds the table and UTF-8 CSV bytes for one stat category from ranked (player, value) pairs."""
+    player_names, values = zip(*ranked_stats)
+    stats_df = pd.DataFrame({"Player": list(player_names), category_name: np.array(values, dtype="int32")})
+    return stats_df, stats_df.to_csv(index=False).encode('utf-8')
 
 # --- Streamlit UI Components ---
 
@@ -327,11 +847,13 @@ if "refresh_data" not in st.session_state:
 
 # Force data refresh if needed
 if st.session_state["refresh_data"]:
-    get_all_tournaments_data.clear() # Clear cache for this function
+    get_tournament.clear()
+    get_top_players.clear()
+    get_all_player_stats.clear()
+    for key in [k for k in st.session_state if k.startswith("tdata_")]:
+        del st.session_state[key] # Drop stale session copies
     st.session_state["refresh_data"] = False # Reset flag
 
-tournaments_data = get_all_tournaments_data()
-
 with st.sidebar:
     st.header("Navigation")
     menu = st.radio("Choose Section", ["Create New Tournament", "Manage Existing Tournaments"])
@@ -339,6 +861,48 @@ with st.sidebar:
     st.markdown("Developed with ❤️ by **Souparna Paul**")
 
 
+@st.fragment
+def render_danger_zone(tid, tournament_name):
+    """Renders the Danger Zone tab. As a fragment, toggling its confirmations reruns only this tab."""
+    st.header("🗑️ Danger Zone")
+    st.warning("⚠️ **Warning: These actions are irreversible!**")
+
+    st.markdown("### Reset All Matches and Stats")
+    st.write("This will clear all match scores and player statistics for this tournament.")
+
+    confirm_reset = st.checkbox("Confirm reset all matches and stats?", key="confirm_reset_matches_stats")
+
+    # One button whose enabled state follows the checkbox
+    if st.button("🚨 Reset Matches & Stats", disabled=not confirm_reset, key="reset_matches_stats_btn",
+                 help="This cannot be undone!" if confirm_reset else "Check the box to enable reset."):
+        with st.spinner("Resetting..."):
+            if reset_tournament_results(tid):
+                st.success("Matches and stats reset successfully.")
+                st.rerun() # Full rerun so the other tabs redraw from the emptied session copy
+            else:
+                st.error("Failed to reset matches and stats.")
+
+
+    st.markdown("### Delete Tournament")
+    st.write("Permanently delete this tournament and all its associated data.")
+
+    # The checkbox controls whether the delete button appears/is actionable
+    confirm_delete = st.checkbox(f"Confirm deletion of '{tournament_name}'?", key="confirm_delete_tournament")
+
+    # The delete button is only active if the checkbox is checked
+    if st.button("🔥🔥🔥 Delete Tournament PERMANENTLY", disabled=not confirm_delete, key="delete_tournament_btn",
+                 help="This cannot be undone!" if confirm_delete else "Check the box to enable deletion."):
+        with st.spinner("Deleting tournament..."):
+            if delete_tournament(tid):
+                st.success(f"Tournament '{tournament_name}' deleted.")
+                # Clear selection and data cache, then rerun
+                if "selected_tournament_id" in st.session_state:
+                    del st.session_state["selected_tournament_id"]
+                st.rerun()
+            else:
+                st.error("Failed to delete tournament.")
+
+
 # --- Create Tournament Section ---
 if menu == "Create New Tournament":
     st.header("➕ Create a New Tournament")
@@ -351,54 +915,72 @@ if menu == "Create New Tournament":
 
         submitted = st.form_submit_button("Create Tournament")
         if submitted:
-            team_list = [team.strip() for team in teams_input.splitlines() if team.strip()]
+            team_list = [team for team in map(str.strip, teams_input.splitlines()) if team]
             if not t_name:
                 st.error("❗ Tournament Name cannot be empty.")
             elif len(team_list) < 2:
                 st.error("❗ Please enter at least 2 teams.")
             else:
                 with st.spinner("Creating tournament..."):
-                    tid = create_tournament(t_name, TOURNAMENT_TYPES[t_type_key], sport)
+                    tid = create_tournament(t_name, TOURNAMENT_TYPES[t_type_key], sport, team_list)
                     if tid:
-                        for team in team_list:
-                            add_team_to_tournament(tid, team) # Adds teams and initializes players dict
                         st.success(f"🎉 Tournament '{t_name}' created successfully! ID: `{tid}`")
                         st.session_state["selected_tournament_id"] = tid # Auto-select
-                        st.session_state["refresh_data"] = True # Ensure UI updates
                         st.rerun() # Rerun to switch to manage section
 
 
 # --- Manage Tournament Section ---
 elif menu == "Manage Existing Tournaments":
-    if not tournaments_data:
-        st.warning("No tournaments found. Create one first!")
+    name_prefix = st.text_input("🔍 Search tournaments", placeholder="Start of the tournament name").strip()
+    tournament_index = get_tournament_index(name_prefix)
+    if not tournament_index:
+        if name_prefix:
+            st.warning(f"No tournaments found starting with '{name_prefix}'.")
+        else:
+            st.warning("No tournaments found. Create one first!")
         st.stop()
 
-    tournament_names = {data["name"]: tid for tid, data in tournaments_data.items()}
-    
+    # Select by id so tournaments sharing a name stay distinct; names are only labels
+    tournament_ids = [tid for tid, _ in tournament_index]
+    tournament_names = dict(tournament_index)
+
     # Pre-select if a tournament was just created
     default_index = 0
-    if "selected_tournament_id" in st.session_state and st.session_state["selected_tournament_id"] in tournament_names.values():
-        default_index = list(tournament_names.values()).index(st.session_state["selected_tournament_id"])
+    if st.session_state.get("selected_tournament_id") in tournament_names:
+        default_index = tournament_ids.index(st.session_state["selected_tournament_id"])
 
-    selected_tournament_name = st.selectbox(
+    tid = st.selectbox(
         "Select Tournament to Manage",
-        list(tournament_names.keys()),
+        tournament_ids,
         index=default_index,
+        format_func=tournament_names.get,
         key="tournament_selector"
     )
-    
-    tid = tournament_names[selected_tournament_name]
-    current_tournament = tournaments_data[tid]
+    selected_tournament_name = tournament_names[tid]
+    # Only the selected tournament is read in full. The copy is not refreshed on the rerun that
+    # saves match scores: new fixtures would change the score editor's key and drop the edits.
+    current_tournament = load_tournament(tid, refresh=not st.session_state.get("save_match_scores"))
+    if not current_tournament:
+        st.error("❗ Could not load the selected tournament.")
+        st.stop()
+
+    # Destructure the snapshot once; every tab below reads from these locals
+    teams = current_tournament.get("teams", [])
+    matches = current_tournament.get("matches", [])
+    players = current_tournament.get("players", {})
+    sport = current_tournament["sport"]
 
     st.markdown("---")
     st.subheader(f"⚙️ Managing: **{current_tournament['name']}**")
-    st.markdown(f"**Type:** {TOURNAMENT_TYPES.get(current_tournament['type'], current_tournament['type'])} | **Sport:** {current_tournament['sport']}")
+    st.markdown(f"**Type:** {TOURNAMENT_TYPE_LABELS.get(current_tournament['type'], current_tournament['type'])} | **Sport:** {sport}")
 
-    tabs = st.tabs(["🏠 Overview", "👥 Teams & Players", "📋 Matches", "🏅 Leaderboard", "📊 Stats", "🗑️ Danger Zone"])
+    # A section switcher instead of st.tabs: st.tabs builds every tab body on each rerun,
+    # while only the selected section runs here
+    tabs = ["🏠 Overview", "👥 Teams & Players", "📋 Matches", "🏅 Leaderboard", "📊 Stats", "🗑️ Danger Zone"]
+    active_tab = st.radio("Section", tabs, horizontal=True, label_visibility="collapsed", key="active_manage_tab")
 
     # --- Overview Tab ---
-    with tabs[0]:
+    if active_tab == tabs[0]:
         st.header(f"🏠 Overview: {current_tournament['name']}")
         # Safely display creation date, handling older tournaments without the field
         created_at_timestamp = current_tournament.get("created_at")
@@ -410,34 +992,34 @@ elif menu == "Manage Existing Tournaments":
         st.info(f"Tournament ID: `{tid}`")
 
         st.subheader("Current Teams")
-        if current_tournament.get("teams"):
-            st.dataframe(pd.DataFrame({"Team Name": current_tournament["teams"]}), use_container_width=True)
+        if teams:
+            st.dataframe(pd.DataFrame({"Team Name": teams}), use_container_width=True)
         else:
             st.info("No teams added yet.")
 
     # --- Teams & Players Tab ---
-    with tabs[1]:
+    if active_tab == tabs[1]:
         st.header("👥 Team & Player Management")
 
         st.subheader("Add/Remove Teams")
         col_add_team, col_remove_team = st.columns(2)
         with col_add_team:
-            new_team_name = st.text_input("New Team Name")
-            if st.button("Add Team", key="add_team_btn"):
-                if new_team_name.strip():
-                    if new_team_name.strip() not in current_tournament.get("teams", []):
-                        if add_team_to_tournament(tid, new_team_name.strip()):
-                            st.success(f"Team '{new_team_name}' added.")
-                            st.rerun()
-                        else:
-                            st.error("Failed to add team.")
-                    else:
-                        st.warning("Team already exists.")
-                else:
+            new_teams_input = st.text_area("New Team Names (one per line)", placeholder="Team D\nTeam E")
+            if st.button("Add Teams", key="add_team_btn"):
+                entered_teams = list(dict.fromkeys(team for team in map(str.strip, new_teams_input.splitlines()) if team))
+                new_teams = [team for team in entered_teams if team not in teams]
+                if not entered_teams:
                     st.warning("Team name cannot be empty.")
+                elif not new_teams:
+                    st.warning("Team already exists.")
+                elif add_teams_to_tournament(tid, new_teams):
+                    st.success(f"Added {len(new_teams)} team(s): {', '.join(new_teams)}.")
+                    st.rerun()
+                else:
+                    st.error("Failed to add teams.")
         with col_remove_team:
-            if current_tournament.get("teams"):
-                team_to_remove = st.selectbox("Select Team to Remove", current_tournament["teams"])
+            if teams:
+                team_to_remove = st.selectbox("Select Team to Remove", teams)
                 if st.button("Remove Team", key="remove_team_btn", help="Removing a team is irreversible and will delete its players from the tournament data."):
                     if st.warning(f"Are you sure you want to remove '{team_to_remove}'? This cannot be undone."):
                         if remove_team_from_tournament(tid, team_to_remove):
@@ -450,26 +1032,27 @@ elif menu == "Manage Existing Tournaments":
 
         st.markdown("---")
         st.subheader("Manage Players within Teams")
-        if not current_tournament.get("teams"):
+        if not teams:
             st.info("Please add teams first to manage players.")
         else:
-            selected_team_for_player = st.selectbox("Select Team", current_tournament["teams"], key="player_team_selector")
+            selected_team_for_player = st.selectbox("Select Team", teams, key="player_team_selector")
 
-            players_in_selected_team = current_tournament.get("players", {}).get(selected_team_for_player, [])
+            players_in_selected_team = players.get(selected_team_for_player, [])
             st.write(f"Players in {selected_team_for_player}: {', '.join(players_in_selected_team) if players_in_selected_team else 'No players yet.'}")
 
             col_add_player, col_remove_player = st.columns(2)
             with col_add_player:
                 new_player_name = st.text_input(f"Add Player to {selected_team_for_player}")
                 if st.button("Add Player", key="add_player_btn"):
-                    if new_player_name.strip():
-                        if add_player_to_team(tid, selected_team_for_player, new_player_name.strip()):
-                            st.success(f"Player '{new_player_name}' added to {selected_team_for_player}.")
-                            st.rerun()
-                        else:
-                            st.error("Failed to add player or player already exists.")
-                    else:
+                    if not new_player_name.strip():
                         st.warning("Player name cannot be empty.")
+                    elif new_player_name.strip() in players_in_selected_team:
+                        st.warning("Player already exists in this team.")
+                    elif add_player_to_team(tid, selected_team_for_player, new_player_name.strip()):
+                        st.success(f"Player '{new_player_name}' added to {selected_team_for_player}.")
+                        st.rerun()
+                    else:
+                        st.error("Failed to add player.")
             with col_remove_player:
                 if players_in_selected_team:
                     player_to_remove = st.selectbox(f"Remove Player from {selected_team_for_player}", players_in_selected_team)
@@ -483,21 +1066,27 @@ elif menu == "Manage Existing Tournaments":
                     st.info("No players to remove from this team.")
 
     # --- Matches Tab ---
-    with tabs[2]:
+    if active_tab == tabs[2]:
         st.header("📋 Match Fixtures")
-        if not current_tournament.get("matches"):
-            if not current_tournament.get("teams") or len(current_tournament["teams"]) < 2:
+        if not matches:
+            if not teams or len(teams) < 2:
                 st.warning("Please add at least two teams before generating fixtures.")
             else:
+                seeding = "random"
+                if current_tournament["type"] == "Knockout":
+                    seeding_label = st.radio("Knockout Seeding", ["Random draw", "Standard (team order = seed)"], horizontal=True,
+                                             help="Standard seeding pairs seed 1 vs the last seed, seed 2 vs the second-to-last, and so on.")
+                    seeding = "standard" if seeding_label.startswith("Standard") else "random"
                 if st.button("Generate Fixtures", help="Generate fixtures for the selected tournament type."):
                     with st.spinner("Generating matches..."):
                         generated_matches = []
-                        if "Knockout" in current_tournament["type"]:
-                            generated_matches = generate_knockout_matches(current_tournament["teams"])
-                        elif "Combination" in current_tournament["type"]:
-                            generated_matches = generate_combination_matches(current_tournament["teams"])
+                        # Compare the stored values exactly: "Group + Knockout" also contains "Knockout"
+                        if current_tournament["type"] == "Knockout":
+                            generated_matches = generate_knockout_matches(teams, seeding)
+                        elif current_tournament["type"] == "Group + Knockout":
+                            generated_matches = generate_combination_matches(teams)
                         else: # League or Premier League
-                            generated_matches = generate_round_robin_matches(current_tournament["teams"])
+                            generated_matches = generate_round_robin_matches(teams)
 
                         if generated_matches:
                             if save_matches(tid, generated_matches):
@@ -508,122 +1097,130 @@ elif menu == "Manage Existing Tournaments":
                         else:
                             st.warning("Could not generate matches. Ensure enough teams are added for the selected tournament type.")
         else:
-            st.info(f"Total Matches: **{len(current_tournament['matches'])}**")
-
-            match_data_for_display = []
-            for idx, match in enumerate(current_tournament["matches"]):
-                match_display_info = {
-                    "Match #": idx + 1,
-                    "Team 1": match["team1"],
-                    "Team 2": match["team2"],
-                    "Score": f"{match['score1'] or '?'} - {match['score2'] or '?'}"
-                }
-                if "group" in match:
-                    match_display_info["Group"] = match["group"]
-                if "round" in match:
-                    match_display_info["Round"] = match["round"]
-                match_data_for_display.append(match_display_info)
-
-            st.dataframe(pd.DataFrame(match_data_for_display), use_container_width=True)
+            st.info(f"Total Matches: **{len(matches)}**")
+
+            st.subheader("Fixtures & Scores")
+
+            # Scores are edited in one table inside a form, so editing does not rerun the page and
+            # saving commits every changed match together. The editor key follows the fixtures,
+            # so saved or regenerated matches start from a clean table.
+            fixtures = fixtures_key(matches)
+            match_df = build_match_df(fixtures)
+            with st.form("match_scores_form"):
+                edited_match_df = st.data_editor(
+                    match_df,
+                    num_rows="fixed",
+                    hide_index=True,
+                    use_container_width=True,
+                    disabled=[column for column in match_df.columns if column not in SCORE_COLUMNS],
+                    column_config={
+                        column: st.column_config.NumberColumn(column, min_value=0, step=1)
+                        for column in SCORE_COLUMNS
+                    },
+                    key=f"match_scores_editor_{hash(fixtures)}"
+                )
+
+                if st.form_submit_button("Save Match Scores", key="save_match_scores"):
+                    changed_scores = changed_match_scores(match_df, edited_match_df)
+                    if not changed_scores:
+                        st.info("No score changes to save.")
+                    elif update_match_scores(tid, changed_scores):
+                        st.success(f"✅ {len(changed_scores)} match score(s) updated!")
+                        st.rerun()
+                    else:
+                        st.error("Failed to update match scores.")
 
             st.markdown("---")
-            st.subheader("Update Match Scores & Stats")
-
-            for idx, match in enumerate(current_tournament["matches"]):
-                st.markdown(f"#### ⚔️ Match {idx + 1}: {match['team1']} vs {match['team2']}")
-                if "group" in match:
-                    st.caption(f"Group: {match['group']}")
-                if "round" in match:
-                    st.caption(f"Round: {match['round']}")
-
-                col_score1, col_score2 = st.columns(2)
-                score1 = col_score1.number_input(f"Score for {match['team1']}", key=f"s1_{idx}", value=match['score1'] or 0, min_value=0)
-                score2 = col_score2.number_input(f"Score for {match['team2']}", key=f"s2_{idx}", value=match['score2'] or 0, min_value=0)
-
-                # Collect all potential players for stat input for this match (from both teams)
-                all_players = []
-                team1_players = current_tournament.get("players", {}).get(match["team1"], [])
-                team2_players = current_tournament.get("players", {}).get(match["team2"], [])
-                all_players.extend(team1_players)
-                all_players.extend(team2_players)
-                all_players = sorted(list(set(all_players))) # Unique and sorted
-
-                if current_tournament["sport"] == "Football":
-                    st.markdown("##### Football Stats")
-                    scorer_player = st.selectbox("⚽ Goal Scorer", [""] + all_players, key=f"goal_player_{idx}")
-                    assist_player = st.selectbox("🎯 Assist Provider", [""] + all_players, key=f"assist_player_{idx}")
-                    
-                    col_football_stat_buttons = st.columns(2)
-                    if col_football_stat_buttons[0].button(f"Add Goal for {scorer_player}", key=f"add_goal_{idx}", disabled=not scorer_player):
-                        if update_player_stat(tid, "scorers", scorer_player):
-                            st.success(f"Goal recorded for {scorer_player}.")
-                            st.rerun()
-                    if col_football_stat_buttons[1].button(f"Add Assist for {assist_player}", key=f"add_assist_{idx}", disabled=not assist_player):
-                        if update_player_stat(tid, "assists", assist_player):
-                            st.success(f"Assist recorded for {assist_player}.")
-                            st.rerun()
-
-                elif current_tournament["sport"] == "Cricket":
-                    st.markdown("##### Cricket Stats")
-                    runs_scorer = st.selectbox("🏏 Batsman (Runs)", [""] + all_players, key=f"runs_scorer_{idx}")
-                    wickets_taker = st.selectbox("🎯 Bowler (Wickets)", [""] + all_players, key=f"wickets_taker_{idx}")
-                    
-                    col_cricket_stat_buttons = st.columns(2)
-                    if col_cricket_stat_buttons[0].button(f"Add Run for {runs_scorer}", key=f"add_run_{idx}", disabled=not runs_scorer):
-                        if update_player_stat(tid, "runs", runs_scorer):
-                            st.success(f"Run recorded for {runs_scorer}.")
-                            st.rerun()
-                    if col_cricket_stat_buttons[1].button(f"Add Wicket for {wickets_taker}", key=f"add_wicket_{idx}", disabled=not wickets_taker):
-                        if update_player_stat(tid, "wickets", wickets_taker):
-                            st.success(f"Wicket recorded for {wickets_taker}.")
-                            st.rerun()
+            st.subheader("Record Player Stats")
+
+            # Stats are entered for one selected match at a time, so the page holds one set of
+            # stat widgets instead of a set per match
+            idx = st.selectbox(
+                "Match",
+                range(len(matches)),
+                format_func=lambda i: f"Match {i + 1}: {matches[i]['team1']} vs {matches[i]['team2']}",
+                key="stats_match_selector"
+            )
+            match = matches[idx]
 
-                elif current_tournament["sport"] == "Basketball":
-                    st.markdown("##### Basketball Stats")
-                    points_scorer = st.selectbox("🏀 Player (Points)", [""] + all_players, key=f"points_scorer_{idx}")
-                    bball_assist_player = st.selectbox("🎯 Player (Assists)", [""] + all_players, key=f"bball_assist_player_{idx}")
+            # All potential players for stat input for this match (from both teams), unique and sorted
+            all_players = sorted(set(players.get(match["team1"], [])).union(players.get(match["team2"], [])))
 
-                    col_bball_stat_buttons = st.columns(2)
-                    if col_bball_stat_buttons[0].button(f"Add Point for {points_scorer}", key=f"add_point_{idx}", disabled=not points_scorer):
-                        if update_player_stat(tid, "points", points_scorer):
-                            st.success(f"Point recorded for {points_scorer}.")
-                            st.rerun()
-                    if col_bball_stat_buttons[1].button(f"Add Assist for {bball_assist_player}", key=f"add_bball_assist_{idx}", disabled=not bball_assist_player):
-                        if update_player_stat(tid, "assists", bball_assist_player):
-                            st.success(f"Assist recorded for {bball_assist_player}.")
-                            st.rerun()
+            if sport == "Football":
+                st.markdown("##### Football Stats")
+                scorer_player = st.selectbox("⚽ Goal Scorer", [""] + all_players, key=f"goal_player_{idx}")
+                assist_player = st.selectbox("🎯 Assist Provider", [""] + all_players, key=f"assist_player_{idx}")
+                
+                if st.button("Add Goal & Assist", key=f"add_football_stats_{idx}", disabled=not (scorer_player or assist_player)):
+                    queue_player_stats(tid, [("scorers", scorer_player), ("assists", assist_player)])
 
-                elif current_tournament["sport"] == "Badminton":
-                    st.markdown("##### Badminton Stats")
-                    set_winner = st.selectbox("🏸 Player (Set Win)", [""] + all_players, key=f"set_winner_{idx}")
-                    if st.button(f"Record Set Win for {set_winner}", key=f"add_set_win_{idx}", disabled=not set_winner):
-                        if update_player_stat(tid, "sets", set_winner):
-                            st.success(f"Set win recorded for {set_winner}.")
-                            st.rerun()
+            elif sport == "Cricket":
+                st.markdown("##### Cricket Stats")
+                runs_scorer = st.selectbox("🏏 Batsman (Runs)", [""] + all_players, key=f"runs_scorer_{idx}")
+                wickets_taker = st.selectbox("🎯 Bowler (Wickets)", [""] + all_players, key=f"wickets_taker_{idx}")
                 
-                st.markdown("---") # Separator for score update button and next match
-                if st.button("Save Match Score", key=f"update_match_score_{idx}"):
-                    if update_match_score(tid, idx, score1, score2):
-                        st.success("✅ Match score updated!")
+                if st.button("Add Run & Wicket", key=f"add_cricket_stats_{idx}", disabled=not (runs_scorer or wickets_taker)):
+                    queue_player_stats(tid, [("runs", runs_scorer), ("wickets", wickets_taker)])
+
+            elif sport == "Basketball":
+                st.markdown("##### Basketball Stats")
+                points_scorer = st.selectbox("🏀 Player (Points)", [""] + all_players, key=f"points_scorer_{idx}")
+                bball_assist_player = st.selectbox("🎯 Player (Assists)", [""] + all_players, key=f"bball_assist_player_{idx}")
+
+                if st.button("Add Point & Assist", key=f"add_bball_stats_{idx}", disabled=not (points_scorer or bball_assist_player)):
+                    queue_player_stats(tid, [("points", points_scorer), ("assists", bball_assist_player)])
+
+            elif sport == "Badminton":
+                st.markdown("##### Badminton Stats")
+                set_winner = st.selectbox("🏸 Player (Set Win)", [""] + all_players, key=f"set_winner_{idx}")
+                if st.button(f"Add Set Win for {set_winner}", key=f"add_set_win_{idx}", disabled=not set_winner):
+                    queue_player_stats(tid, [("sets", set_winner)])
+
+            # Stat additions above are collected locally and written together
+            pending_stats = pending_player_stats(tid)
+            if pending_stats:
+                st.markdown("##### Pending Stats")
+                st.dataframe(pd.DataFrame(
+                    [(player, category, count) for (category, player), count in pending_stats.items()],
+                    columns=["Player", "Stat", "Count"]
+                ), use_container_width=True)
+                col_save_stats, col_discard_stats = st.columns(2)
+                if col_save_stats.button(f"💾 Save {sum(pending_stats.values())} Pending Stat(s)", key="save_pending_stats_btn"):
+                    if save_pending_player_stats(tid):
+                        st.success("✅ Player stats saved!")
                         st.rerun()
-                    else:
-                        st.error("Failed to update match score.")
-                st.markdown("---") # Separator between matches
+                if col_discard_stats.button("Discard Pending Stats", key="discard_pending_stats_btn"):
+                    del st.session_state[f"pending_stats_{tid}"]
+                    st.rerun()
 
 
     # --- Leaderboard Tab ---
-    with tabs[3]:
+    if active_tab == tabs[3]:
         st.header("🏅 Leaderboard")
-        if current_tournament.get("matches") and current_tournament.get("teams"):
-            leaderboard_df = calculate_leaderboard(
-                current_tournament["matches"],
-                current_tournament["teams"],
-                current_tournament["sport"]
-            )
+        if matches and teams:
+            if "standings" in current_tournament:
+                leaderboard_df = standings_leaderboard(
+                    current_tournament["standings"],
+                    teams,
+                    sport
+                )
+            else:
+                leaderboard_df = calculate_leaderboard(
+                    match_results_key(matches),
+                    tuple(teams),
+                    sport
+                )
             st.dataframe(leaderboard_df, use_container_width=True)
 
+            if st.button("🔄 Rebuild Leaderboard", help="Recalculate standings from every match result.", key="rebuild_leaderboard_btn"):
+                if rebuild_standings(tid):
+                    st.success("Leaderboard rebuilt.")
+                    st.rerun()
+                else:
+                    st.error("Failed to rebuild leaderboard.")
+
             # Download button
-            csv_data = leaderboard_df.to_csv().encode('utf-8')
+            csv_data = dataframe_csv(leaderboard_df)
             st.download_button(
                 label="Download Leaderboard as CSV",
                 data=csv_data,
@@ -635,29 +1232,18 @@ elif menu == "Manage Existing Tournaments":
             st.info("No matches played or teams added yet to generate a leaderboard.")
 
     # --- Stats Tab ---
-    with tabs[4]:
+    if active_tab == tabs[4]:
         st.header("📊 Player Statistics")
-        sport = current_tournament["sport"]
-
-        # Define stat categories for each sport
-        stat_categories = {
-            "Football": {"scorers": "Goals", "assists": "Assists"},
-            "Cricket": {"runs": "Runs", "wickets": "Wickets"},
-            "Basketball": {"points": "Points", "assists": "Assists"},
-            "Badminton": {"sets": "Sets Won"}
-        }
-
-        if sport in stat_categories:
-            for category_key, category_name in stat_categories[sport].items():
+
+        if sport in STAT_CATEGORIES:
+            for category_key, category_name in STAT_CATEGORIES[sport]:
                 st.subheader(f"### Top {category_name}")
-                stats_data = current_tournament.get(category_key, {})
-                if stats_data:
-                    sorted_stats = sorted(stats_data.items(), key=lambda x: x[1], reverse=True)
-                    stats_df = pd.DataFrame(sorted_stats, columns=["Player", category_name])
-                    st.dataframe(stats_df, use_container_width=True)
+                sorted_stats = get_top_players(tid, category_key) # Already sorted by Firestore
+                if sorted_stats:
+                    stats_df, csv_data = build_stats_artifacts(category_name, tuple(sorted_stats))
+                    st.table(stats_df) # At most TOP_PLAYERS_LIMIT rows, so the static table stays small
                     
                     # Download button for individual stats
-                    csv_data = stats_df.to_csv().encode('utf-8')
                     st.download_button(
                         label=f"Download {category_name} Stats",
                         data=csv_data,
@@ -667,61 +1253,33 @@ elif menu == "Manage Existing Tournaments":
                     )
                 else:
                     st.info(f"No {category_name.lower()} recorded yet.")
+
+            # Every category in one table; fetched on request because it reads every player's stats
+            st.markdown("---")
+            export_key = f"export_all_stats_{tid}"
+            if st.button("📦 Prepare All Stats CSV", key="prepare_all_stats_btn"):
+                st.session_state[export_key] = True
+            if st.session_state.get(export_key):
+                all_stats_df = get_all_player_stats(tid, sport)
+                if all_stats_df is not None:
+                    st.download_button(
+                        label="Download All Stats",
+                        data=dataframe_csv(all_stats_df, index=False),
+                        file_name=f"{selected_tournament_name}_all_stats.csv",
+                        mime="text/csv",
+                        key="download_all_stats"
+                    )
+                    if len(all_stats_df) >= PARQUET_EXPORT_MIN_ROWS:
+                        st.download_button(
+                            label="Download All Stats (Parquet)",
+                            data=dataframe_parquet(all_stats_df),
+                            file_name=f"{selected_tournament_name}_all_stats.parquet",
+                            mime="application/vnd.apache.parquet",
+                            key="download_all_stats_parquet"
+                        )
         else:
             st.info("Statistics not configured for this sport yet.")
 
     # --- Danger Zone Tab ---
-    with tabs[5]:
-        st.header("🗑️ Danger Zone")
-        st.warning("⚠️ **Warning: These actions are irreversible!**")
-
-        st.markdown("### Reset All Matches and Stats")
-        st.write("This will clear all match scores and player statistics for this tournament.")
-
-        confirm_reset = st.checkbox("Confirm reset all matches and stats?", key="confirm_reset_matches_stats")
-
-        if confirm_reset:
-            if st.button("🚨 Reset Matches & Stats", help="This cannot be undone!", key="reset_matches_stats_btn"):
-                with st.spinner("Resetting..."):
-                    if update_firestore_doc("tournaments", tid, {
-                        "matches": [],
-                        "scorers": {},
-                        "assists": {},
-                        "runs": {},
-                        "wickets": {},
-                        "points": {},
-                        "sets": {}
-                    }):
-                        st.success("Matches and stats reset successfully.")
-                        st.session_state["refresh_data"] = True # Trigger refresh
-                        st.rerun()
-                    else:
-                        st.error("Failed to reset matches and stats.")
-        else:
-            st.button("🚨 Reset Matches & Stats", disabled=True, help="Check the box to enable reset.", key="disabled_reset_matches_stats_btn")
-            st.info("Please confirm the action by checking the box above.")
-
-
-        st.markdown("### Delete Tournament")
-        st.write("Permanently delete this tournament and all its associated data.")
-
-        # The checkbox controls whether the delete button appears/is actionable
-        confirm_delete = st.checkbox(f"Confirm deletion of '{selected_tournament_name}'?", key="confirm_delete_tournament")
-
-        # Now, the delete button is only active if the checkbox is checked
-        if confirm_delete:
-            if st.button("🔥🔥🔥 Delete Tournament PERMANENTLY", help="This cannot be undone!", key="delete_tournament_btn"):
-                with st.spinner("Deleting tournament..."):
-                    if delete_tournament(tid):
-                        st.success(f"Tournament '{selected_tournament_name}' deleted.")
-                        # Clear selection and data cache, then rerun
-                        if "selected_tournament_id" in st.session_state:
-                            del st.session_state["selected_tournament_id"]
-                        st.session_state["refresh_data"] = True
-                        st.rerun()
-                    else:
-                        st.error("Failed to delete tournament.")
-        else:
-            # Display a disabled button or a message when not confirmed
-            st.button("🔥🔥🔥 Delete Tournament PERMANENTLY", disabled=True, help="Check the box to enable deletion.", key="disabled_delete_tournament_btn")
-            st.info("Please confirm deletion by checking the box above.")
+    if active_tab == tabs[5]:
+        render_danger_zone(tid, selected_tournament_name)